@@ -35,10 +35,278 @@ Author: Created with GitHub Copilot
 License: Public Domain - Have fun with bad spelling! 🌱
 """
 
+import builtins
+import io
+import math
+import os
 import re
 import sys
-import difflib
+import tokenize
+import types
 import argparse
+import functools
+
+try:
+    # Optional: native Levenshtein-based scoring for fuzzy matching
+    from rapidfuzz import fuzz, process as fuzz_process  # pylint: disable=import-error
+except ImportError:
+    fuzz = fuzz_process = None
+
+# Phyton-branded labels for the error types execute() reports specifically.
+# Subclasses (e.g. IndentationError, ModuleNotFoundError) share their base's label.
+_ERROR_LABELS = {
+    SyntaxError: 'PhytonSyntaxError',
+    NameError: 'PhytonNameError',
+    TypeError: 'PhytonTypeError',
+    ValueError: 'PhytonValueError',
+    ImportError: 'PhytonImportError',
+}
+
+# Inputs that leave the interactive REPL (compared lowercased)
+_EXIT_TOKENS = frozenset({'exit()', 'quit()', 'exit', 'quit'})
+
+# Map of correct keywords to their common misspellings. Read-only and shared by
+# every interpreter until it adds misspellings of its own.
+_DEFAULT_MAPPINGS = types.MappingProxyType({
+    'def': ('def', 'deff', 'define', 'defin'),
+    'if': ('if', 'iff', 'iif'),
+    'elif': ('elif', 'elsif', 'elseif', 'else_if'),
+    'else': ('else', 'els', 'elze'),
+    'for': ('for', 'fore', 'four', 'fr'),
+    'while': ('while', 'wile', 'whyle', 'whil'),
+    'in': ('in', 'inn', 'iin'),
+    'return': ('return', 'retrun', 'retrn', 'ret'),
+    'import': ('import', 'imprt', 'imort', 'importt'),
+    'from': ('from', 'frm', 'fom'),
+    'as': ('as', 'az', 'ass'),
+    'class': ('class', 'clas', 'clss', 'klass'),
+    'try': ('try', 'tri', 'tyr'),
+    'except': ('except', 'exept', 'excpt', 'catch'),
+    'finally': ('finally', 'finaly', 'finale'),
+    'with': ('with', 'wth', 'wit'),
+    'and': ('and', 'andd', 'adn'),
+    'or': ('or', 'orr'),
+    'not': ('not', 'nott', 'no'),
+    'is': ('is', 'iz', 'iss'),
+    'True': ('True', 'true', 'TRUE', 'tru'),
+    'False': ('False', 'false', 'FALSE', 'fals'),
+    'None': ('None', 'none', 'NONE', 'null', 'nil'),
+    'print': ('print', 'prin', 'prnt', 'pritn'),
+})
+
+
+def _build_lookup(keyword_mappings):
+    """
+    Flatten a keyword mapping into a misspelling -> correct keyword dict.
+
+    Identity entries (the correct spelling itself) are skipped.
+
+    Args:
+        keyword_mappings (dict): Correct keywords mapped to lists of misspellings
+
+    Returns:
+        dict: Misspellings mapped to their correct keyword
+    """
+    return {
+        misspelling: correct_keyword
+        for correct_keyword, misspellings in keyword_mappings.items()
+        for misspelling in misspellings
+        if misspelling != correct_keyword
+    }
+
+
+def _index_by_length(words):
+    """
+    Group words by their length, keeping their original order within a group.
+
+    Args:
+        words (iterable): Words to index
+
+    Returns:
+        dict: Word lengths mapped to lists of words of that length
+    """
+    words_by_length = {}
+    for word in words:
+        words_by_length.setdefault(len(word), []).append(word)
+    return words_by_length
+
+
+def _length_candidates(words_by_length, length, cutoff):
+    """
+    Collect indexed words long enough and short enough to possibly reach cutoff.
+
+    The edit distance between two words is at least the difference in their
+    lengths, so a similarity of cutoff is only reachable by lengths between
+    length * cutoff / (2 - cutoff) and length * (2 - cutoff) / cutoff.
+
+    Args:
+        words_by_length (dict): Index built by _index_by_length
+        length (int): Length of the word being matched
+        cutoff (float): Minimum similarity ratio between 0 and 1
+
+    Returns:
+        list: Candidate words, grouped by length
+    """
+    shortest = math.ceil(length * cutoff / (2 - cutoff) - 1e-9)
+    longest = math.floor(length * (2 - cutoff) / cutoff + 1e-9)
+    return [
+        word
+        for candidate_length in range(shortest, longest + 1)
+        for word in words_by_length.get(candidate_length, ())
+    ]
+
+
+# Misspellings are whole words, so scanning word runs and looking each one up
+# costs the same per character no matter how many misspellings are registered.
+_WORD_RE = re.compile(r'\w+')
+_DEFAULT_LOOKUP = _build_lookup(_DEFAULT_MAPPINGS)
+_DEFAULT_KEYWORDS_BY_LENGTH = _index_by_length(_DEFAULT_MAPPINGS)
+_DEFAULT_MISSPELLINGS_BY_LENGTH = _index_by_length(_DEFAULT_LOOKUP)
+
+# Token types that bracket an f-string on Python 3.12+; None on older versions
+_FSTRING_START = getattr(tokenize, 'FSTRING_START', None)
+_FSTRING_END = getattr(tokenize, 'FSTRING_END', None)
+
+
+# Sources at least this long are compiled without being cached, so a few big
+# files can't pin their text and code objects in memory.
+_MAX_CACHED_SOURCE = 4096
+
+
+@functools.lru_cache(maxsize=256)
+def _cached_compile(source):
+    """
+    Compile corrected source to a code object, memoized on the source text.
+
+    Repeated snippets (common in REPL sessions) skip tokenize/parse/compile.
+    Sources that fail to compile raise before anything is cached.
+    """
+    return compile(source, '<phyton>', 'exec')
+
+
+def _compile_source(source):
+    """Compile source, using the cache only for snippets under _MAX_CACHED_SOURCE."""
+    if len(source) < _MAX_CACHED_SOURCE:
+        return _cached_compile(source)
+    return _cached_compile.__wrapped__(source)
+
+
+def _indel_distance_leq(a, b, max_d):
+    """
+    Compute the insert/delete edit distance between two strings, up to a bound.
+
+    A substitution counts as a deletion plus an insertion, which makes
+    1 - distance / (len(a) + len(b)) the same similarity rapidfuzz's fuzz.ratio
+    reports. Only cells within max_d of the diagonal are filled in, using two
+    rows the length of the shorter string, and the scan stops as soon as a
+    whole row exceeds the bound.
+
+    Args:
+        a (str): First string
+        b (str): Second string
+        max_d (int): Largest distance of interest
+
+    Returns:
+        int: The distance, or max_d + 1 if it is greater than max_d
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    m, n = len(a), len(b)
+    over = max_d + 1
+    if m - n > max_d:
+        return over
+
+    prev = [min(j, over) for j in range(n + 1)]
+    for i in range(1, m + 1):
+        lo = max(1, i - max_d)
+        hi = min(n, i + max_d)
+        cur = [over] * (n + 1)
+        cur[0] = min(i, over)
+        char = a[i - 1]
+        for j in range(lo, hi + 1):
+            if char == b[j - 1]:
+                cur[j] = prev[j - 1]
+            else:
+                cur[j] = min(prev[j], cur[j - 1]) + 1
+        if min(cur[lo - 1:hi + 1]) > max_d:
+            return over
+        prev = cur
+
+    return min(prev[n], over)
+
+
+def _closest_match(word, choices, cutoff):
+    """
+    Find the choice most similar to word, if it is similar enough.
+
+    Uses rapidfuzz when it is installed and a bounded edit distance otherwise;
+    both score similarity the same way.
+
+    Args:
+        word (str): The potentially misspelled word
+        choices (list): Candidate correct spellings
+        cutoff (float): Minimum similarity ratio between 0 and 1
+
+    Returns:
+        str or None: The best matching choice, or None if none reaches cutoff
+    """
+    if fuzz_process is not None:
+        # processor=None keeps case and punctuation (e.g. else_if) significant,
+        # as in the fallback; rapidfuzz 2.x normalized both by default
+        match = fuzz_process.extractOne(word, choices, scorer=fuzz.ratio,
+                                        processor=None, score_cutoff=cutoff * 100)
+        return match[0] if match else None
+
+    best, best_score = None, cutoff
+    for choice in choices:
+        total = len(word) + len(choice)
+        # The small epsilon keeps e.g. (1 - 0.7) * 10 from rounding down to 2
+        max_d = int((1 - cutoff) * total + 1e-9)
+        # The distance is at least the length difference, so skip hopeless
+        # candidates before scoring them
+        if abs(len(word) - len(choice)) > max_d:
+            continue
+        distance = _indel_distance_leq(word, choice, max_d)
+        if distance > max_d:
+            continue
+        score = 1 - distance / total
+        if best is None or score > best_score:
+            best, best_score = choice, score
+    return best
+
+
+def _read_source(filename):
+    """
+    Read a source file with raw os-level reads and decode it once as UTF-8.
+
+    Skips the buffered text-mode layer; compile() handles CRLF line endings
+    itself, so no newline translation is needed.
+
+    Args:
+        filename (str): Path of the file to read
+
+    Returns:
+        str: The decoded file contents
+
+    Raises:
+        OSError: If the file cannot be opened or read
+        UnicodeDecodeError: If the file is not valid UTF-8
+    """
+    fd = os.open(filename, os.O_RDONLY)
+    try:
+        chunks = []
+        remaining = os.fstat(fd).st_size
+        # st_size is only a hint (e.g. 0 for pipes), so read until EOF
+        while True:
+            chunk = os.read(fd, max(remaining, 65536))
+            if not chunk:
+                break
+            chunks.append(chunk)
+            remaining -= len(chunk)
+    finally:
+        os.close(fd)
+    return b''.join(chunks).decode('utf-8')
+
 
 class PhytonArgumentParser:
     """Argument parser that accepts misspellings of options."""
@@ -61,6 +329,8 @@ class PhytonArgumentParser:
             'interactive': ['interactiv', 'interact', 'inter', 'intractiv'],
             'help': ['halp', 'helap', 'hepl', 'hep']
         }
+        # Flattened once so known misspellings are a single dict lookup
+        self._option_lookup = _build_lookup(self.option_mappings)
 
         # Add arguments
         self.parser.add_argument(
@@ -106,17 +376,16 @@ class PhytonArgumentParser:
             return option
 
         # Check misspelling mappings
-        for correct, misspellings in self.option_mappings.items():
-            if option in misspellings:
-                print(f"🔧 Fixed option: --{option} → --{correct}")
-                return correct
+        correct = self._option_lookup.get(option)
+        if correct:
+            print(f"🔧 Fixed option: --{option} → --{correct}")
+            return correct
 
         # If no exact match found, try fuzzy matching
-        all_options = list(self.option_mappings.keys())
-        matches = difflib.get_close_matches(option, all_options, n=1, cutoff=0.7)
-        if matches:
-            print(f"🔧 Fixed option: --{option} → --{matches[0]} (fuzzy match)")
-            return matches[0]
+        match = _closest_match(option, list(self.option_mappings), 0.7)
+        if match:
+            print(f"🔧 Fixed option: --{option} → --{match} (fuzzy match)")
+            return match
 
         return None
 
@@ -132,7 +401,7 @@ class PhytonArgumentParser:
         return self.parser.parse_args(fixed_args)
 
 
-class PhytonInterpreter:
+class PhytonInterpreter:  # pylint: disable=too-many-instance-attributes
     """
     A Python interpreter that accepts multiple spellings of keywords.
 
@@ -141,51 +410,56 @@ class PhytonInterpreter:
     spelling or typing accuracy.
 
     Attributes:
-        keyword_mappings (dict): Dictionary mapping correct keywords to lists of misspellings
+        keyword_mappings (dict): Dictionary mapping correct keywords to their misspellings.
+                                 Until misspellings or keywords are added this is
+                                 the shared read-only default of tuples.
     """
 
-    def __init__(self, fuzzy_matching=False):
+    def __init__(self, fuzzy_matching=False, verbose=None):
         """
         Initialize the Phyton interpreter with keyword mapping dictionary.
 
-        Sets up a comprehensive mapping of correct keywords to lists of their
-        common misspellings. This structure makes it easier to maintain and
-        extend the misspelling database.
+        Uses the module-level mapping of correct keywords to lists of their
+        common misspellings, precompiled once at import. Instances share it
+        until they add their own misspellings or keywords.
 
         Args:
             fuzzy_matching (bool): Enable fuzzy matching for unknown misspellings.
                                  When True, uses similarity algorithms to guess
                                  corrections for typos not in the dictionary.
                                  Default is False for predictable behavior.
+            verbose (bool): Print the corrected code before executing it.
+                            Defaults to True when the PHYTON_DEBUG environment
+                            variable is set, False otherwise.
         """
         self.fuzzy_matching = fuzzy_matching
-        # Map of correct keywords to lists of their common misspellings
-        self.keyword_mappings = {
-            'def': ['def', 'deff', 'define', 'defin'],
-            'if': ['if', 'iff', 'iif'],
-            'elif': ['elif', 'elsif', 'elseif', 'else_if'],
-            'else': ['else', 'els', 'elze'],
-            'for': ['for', 'fore', 'four', 'fr'],
-            'while': ['while', 'wile', 'whyle', 'whil'],
-            'in': ['in', 'inn', 'iin'],
-            'return': ['return', 'retrun', 'retrn', 'ret'],
-            'import': ['import', 'imprt', 'imort', 'importt'],
-            'from': ['from', 'frm', 'fom'],
-            'as': ['as', 'az', 'ass'],
-            'class': ['class', 'clas', 'clss', 'klass'],
-            'try': ['try', 'tri', 'tyr'],
-            'except': ['except', 'exept', 'excpt', 'catch'],
-            'finally': ['finally', 'finaly', 'finale'],
-            'with': ['with', 'wth', 'wit'],
-            'and': ['and', 'andd', 'adn'],
-            'or': ['or', 'orr'],
-            'not': ['not', 'nott', 'no'],
-            'is': ['is', 'iz', 'iss'],
-            'True': ['True', 'true', 'TRUE', 'tru'],
-            'False': ['False', 'false', 'FALSE', 'fals'],
-            'None': ['None', 'none', 'NONE', 'null', 'nil'],
-            'print': ['print', 'prin', 'prnt', 'pritn'],
-        }
+        if verbose is None:
+            verbose = bool(os.environ.get('PHYTON_DEBUG'))
+        self.verbose = verbose
+        # Shared, precompiled defaults; copied on first add_misspelling/add_keyword
+        self.keyword_mappings = _DEFAULT_MAPPINGS
+        self._lookup = _DEFAULT_LOOKUP
+        self._keywords_by_length = _DEFAULT_KEYWORDS_BY_LENGTH
+        self._misspellings_by_length = _DEFAULT_MISSPELLINGS_BY_LENGTH
+        self._cached_fuzzy_match = functools.lru_cache(maxsize=1024)(self._score_fuzzy_match)
+        # Namespace for user code, kept apart from Phyton's own module globals
+        self._user_globals = {'__builtins__': builtins, '__name__': '__main__', '__doc__': None}
+
+    def _own_mappings(self):
+        """Give this instance a private copy of the shared default mappings."""
+        if self.keyword_mappings is _DEFAULT_MAPPINGS:
+            self.keyword_mappings = {
+                correct_keyword: list(misspellings)
+                for correct_keyword, misspellings in _DEFAULT_MAPPINGS.items()
+            }
+
+    def _rebuild_lookup(self):
+        """Rebuild the misspelling lookup and length indexes after keyword_mappings changes."""
+        self._lookup = _build_lookup(self.keyword_mappings)
+        self._keywords_by_length = _index_by_length(self.keyword_mappings)
+        self._misspellings_by_length = _index_by_length(self._lookup)
+        # Earlier fuzzy results may be stale now; start a fresh cache
+        self._cached_fuzzy_match = functools.lru_cache(maxsize=1024)(self._score_fuzzy_match)
 
     def add_misspelling(self, correct_keyword, misspelling):
         """
@@ -200,7 +474,9 @@ class PhytonInterpreter:
         """
         if correct_keyword in self.keyword_mappings:
             if misspelling not in self.keyword_mappings[correct_keyword]:
+                self._own_mappings()
                 self.keyword_mappings[correct_keyword].append(misspelling)
+                self._rebuild_lookup()
             return True
         return False
 
@@ -217,7 +493,9 @@ class PhytonInterpreter:
         elif correct_keyword not in misspellings:
             misspellings.insert(0, correct_keyword)
 
+        self._own_mappings()
         self.keyword_mappings[correct_keyword] = misspellings
+        self._rebuild_lookup()
 
     def get_misspellings(self, correct_keyword):
         """
@@ -229,14 +507,16 @@ class PhytonInterpreter:
         Returns:
             list: List of misspellings, or empty list if keyword not found
         """
-        return self.keyword_mappings.get(correct_keyword, [])
+        return list(self.keyword_mappings.get(correct_keyword, ()))
 
     def find_fuzzy_match(self, word):
         """
         Find the closest matching keyword using fuzzy string matching.
 
-        Uses difflib to find similar keywords based on string similarity.
-        Only returns matches above a certain confidence threshold.
+        Uses rapidfuzz (or a pure-Python edit distance when rapidfuzz is not
+        installed) to find similar keywords based on string similarity. Only
+        returns matches above a certain confidence threshold. Results are
+        cached per word until keywords or misspellings are added.
 
         Args:
             word (str): The potentially misspelled word to match
@@ -246,10 +526,10 @@ class PhytonInterpreter:
         """
         if not self.fuzzy_matching:
             return None
+        return self._cached_fuzzy_match(word)
 
-        # Get all correct keywords
-        all_keywords = list(self.keyword_mappings.keys())
-
+    def _score_fuzzy_match(self, word):
+        """Score word against the keywords and misspellings; see find_fuzzy_match."""
         # Use adaptive threshold based on word length to avoid false positives
         # Shorter words need higher similarity to avoid false matches
         if len(word) <= 3:
@@ -259,16 +539,19 @@ class PhytonInterpreter:
         else:
             threshold = 0.7
 
-        # Try direct similarity with keywords
-        matches = difflib.get_close_matches(word, all_keywords, n=1, cutoff=threshold)
-        if matches:
-            return matches[0]
+        # Try direct similarity with keywords, scoring only those whose length
+        # leaves them able to reach the threshold
+        candidates = _length_candidates(self._keywords_by_length, len(word), threshold)
+        match = _closest_match(word, candidates, threshold)
+        if match:
+            return match
 
-        # Try matching against known misspellings with same adaptive threshold
-        for correct, misspellings in self.keyword_mappings.items():
-            for misspelling in misspellings:
-                if difflib.SequenceMatcher(None, word, misspelling).ratio() >= threshold:
-                    return correct
+        # Try matching against known misspellings with same adaptive threshold.
+        # The lookup omits identity entries, which were already scored above.
+        candidates = _length_candidates(self._misspellings_by_length, len(word), threshold)
+        match = _closest_match(word, candidates, threshold)
+        if match:
+            return self._lookup[match]
 
         return None
 
@@ -276,11 +559,13 @@ class PhytonInterpreter:
         """
         Fix common misspellings of Python keywords in the provided code.
 
-        Uses regex with word boundaries to replace misspelled keywords with their
-        correct equivalents while preserving the rest of the code structure.
+        Tokenizes the code and rewrites only NAME tokens found in the misspelling
+        table, so string literals and comments are left untouched. Code that
+        cannot be tokenized (e.g. unbalanced brackets) falls back to replacing
+        every matching word in the whole text.
 
         If fuzzy_matching is enabled, also attempts to correct unknown misspellings
-        using similarity algorithms.
+        using similarity algorithms, in the same pass over the tokens.
 
         Args:
             code (str): The Phyton source code containing potential misspellings
@@ -288,61 +573,87 @@ class PhytonInterpreter:
         Returns:
             str: The code with misspellings corrected to valid Python syntax
         """
-        # First pass: exact matches from dictionary
-        fixed_code = code
-
-        for correct_keyword, misspellings in self.keyword_mappings.items():
-            for misspelling in misspellings:
-                # Skip if it's already the correct keyword
-                if misspelling == correct_keyword:
-                    continue
-
-                # Use word boundaries to avoid partial matches
-                pattern = r'\b' + re.escape(misspelling) + r'\b'
-                fixed_code = re.sub(pattern, correct_keyword, fixed_code)
-
-        # Second pass: fuzzy matching (if enabled)
+        # Exact matches and fuzzy guesses are resolved per word in one pass
         if self.fuzzy_matching:
-            fixed_code = self._apply_fuzzy_matching(fixed_code)
+            return self._replace_names(code, self._fuzzy_corrector())
 
-        return fixed_code
+        # Exact matches only. A cheap word scan first lets correctly spelled
+        # code skip tokenizing entirely.
+        if self._lookup.keys().isdisjoint(_WORD_RE.findall(code)):
+            return code
+        return self._replace_names(code, self._lookup.get)
 
-    def _apply_fuzzy_matching(self, code):
+    @staticmethod
+    def _replace_names(code, correct):
         """
-        Apply fuzzy matching to find potential corrections for unknown words.
+        Replace every name in the code for which correct() returns a word.
 
-        This is a separate method to keep the main fix_spelling method clean.
+        Only NAME tokens are considered, so string literals and comments are
+        left untouched. That includes f-string replacement fields, which Python
+        3.12+ tokenizes into NAME tokens while older versions yield one STRING
+        token, so the result doesn't depend on the Python version. Replacements
+        are spliced into the original text by token position, so whitespace and
+        layout are preserved exactly. Code that cannot be tokenized falls back
+        to replacing every matching word.
 
         Args:
-            code (str): Code after exact matching corrections
+            code (str): The Phyton source code containing potential misspellings
+            correct (callable): Maps a name to its replacement, or None to keep it
 
         Returns:
-            str: Code with additional fuzzy matching corrections applied
+            str: The code with the names replaced
         """
-        # Find all identifier-like words in the code
-        words = re.findall(r'\b[a-zA-Z_][a-zA-Z0-9_]*\b', code)
-
-        # Track what we've already processed to avoid duplicates
-        processed_words = set()
-        fixed_code = code
+        line_starts = [0] + [match.end() for match in re.finditer('\n', code)]
+        pieces = []
+        position = 0
+        fstring_depth = 0
 
-        for word in words:
-            # Skip if already processed or if it's a known correct keyword
-            if word in processed_words or word in self.keyword_mappings:
-                continue
-
-            processed_words.add(word)
+        try:
+            for token in tokenize.generate_tokens(io.StringIO(code).readline):
+                if token.type == _FSTRING_START:
+                    fstring_depth += 1
+                elif token.type == _FSTRING_END:
+                    fstring_depth -= 1
+                elif token.type == tokenize.NAME and not fstring_depth:
+                    replacement = correct(token.string)
+                    if replacement:
+                        start = line_starts[token.start[0] - 1] + token.start[1]
+                        pieces.append(code[position:start])
+                        pieces.append(replacement)
+                        position = start + len(token.string)
+        except (tokenize.TokenError, SyntaxError):
+            # Unbalanced brackets or bad indentation
+            return _WORD_RE.sub(lambda match: correct(match.group(0)) or match.group(0), code)
+
+        pieces.append(code[position:])
+        return ''.join(pieces)
+
+    def _fuzzy_corrector(self):
+        """
+        Build a per-call correction function for fix_spelling's fuzzy mode.
 
-            # Try to find a fuzzy match
-            fuzzy_match = self.find_fuzzy_match(word)
-            if fuzzy_match:
-                # Apply the correction
-                pattern = r'\b' + re.escape(word) + r'\b'
-                fixed_code = re.sub(pattern, fuzzy_match, fixed_code)
-                # Let user know about fuzzy corrections
-                print(f"# Phyton fuzzy match: '{word}' -> '{fuzzy_match}'")
+        Known misspellings are corrected from the dictionary. Other words are
+        fuzzy matched once each, in order of first appearance, and every
+        fuzzy correction is announced.
 
-        return fixed_code
+        Returns:
+            callable: Maps a word to its correction, or None to keep it
+        """
+        corrections = {}
+
+        def correct(word):
+            if word not in corrections:
+                fuzzy_match = self._lookup.get(word)
+                # Skip known misspellings and correct keywords
+                if fuzzy_match is None and word not in self.keyword_mappings:
+                    fuzzy_match = self.find_fuzzy_match(word)
+                    if fuzzy_match:
+                        # Let user know about fuzzy corrections
+                        print(f"# Phyton fuzzy match: '{word}' -> '{fuzzy_match}'")
+                corrections[word] = fuzzy_match
+            return corrections[word]
+
+        return correct
 
     def execute(self, code):
         """
@@ -356,8 +667,10 @@ class PhytonInterpreter:
             code (str): The Phyton source code to execute
 
         Side Effects:
-            - Prints corrected code if spelling fixes were applied
-            - Executes the code in the global namespace
+            - Prints corrected code if spelling fixes were applied and
+              verbose is enabled
+            - Executes the code in this interpreter's own namespace, which
+              persists across calls
             - Prints specific error messages for different error types:
               * SyntaxError: Invalid Python syntax
               * NameError: Undefined variable or function
@@ -372,28 +685,23 @@ class PhytonInterpreter:
             fixed_code = self.fix_spelling(code)
 
             # Print what we're executing (for debugging)
-            if fixed_code != code:
+            if self.verbose and fixed_code != code:
                 print(f"# Phyton: Fixed spelling -> {fixed_code}")
 
             # Execute the fixed code
-            exec(fixed_code, globals())  # pylint: disable=exec-used
-
-        except SyntaxError as e:
-            print(f"PhytonSyntaxError: {e}")
-        except NameError as e:
-            print(f"PhytonNameError: {e}")
-        except TypeError as e:
-            print(f"PhytonTypeError: {e}")
-        except ValueError as e:
-            print(f"PhytonValueError: {e}")
-        except ImportError as e:
-            print(f"PhytonImportError: {e}")
+            exec(_compile_source(fixed_code), self._user_globals)  # pylint: disable=exec-used
+
         except KeyboardInterrupt:
             print("PhytonKeyboardInterrupt: Execution interrupted")
         except Exception as e:  # pylint: disable=broad-exception-caught
-            # Last resort - but now we know it's something unexpected
-            print(f"PhytonUnexpectedError: {type(e).__name__}: {e}")
-            print("This might be a bug in Phyton or an unusual error condition.")
+            label = next((label for error_type, label in _ERROR_LABELS.items()
+                          if isinstance(e, error_type)), None)
+            if label:
+                print(f"{label}: {e}")
+            else:
+                # Last resort - but now we know it's something unexpected
+                print(f"PhytonUnexpectedError: {type(e).__name__}: {e}\n"
+                      "This might be a bug in Phyton or an unusual error condition.")
 
     def interactive_mode(self):
         """
@@ -415,57 +723,69 @@ class PhytonInterpreter:
             - Continuously prompts for user input until exit
             - Executes user commands and displays results
         """
-        print("Welcome to Phyton 🌱 (Greek for 'plant')")
-        print("The Python interpreter for bad spellers!")
-        print("Type 'exit()' or 'quit()' to leave")
-        print("Use empty line to execute multi-line statements")
-        print()
+        sys.stdout.write("Welcome to Phyton 🌱 (Greek for 'plant')\n"
+                         "The Python interpreter for bad spellers!\n"
+                         "Type 'exit()' or 'quit()' to leave\n"
+                         "Use empty line to execute multi-line statements\n\n")
 
-        multi_line_buffer = []
+        # Lines of the pending block, accumulated without re-joining a list
+        multi_line_buffer = io.StringIO()
+        multi_line_count = 0
 
         while True:
             try:
-                if multi_line_buffer:
+                if multi_line_count:
                     prompt = "phyton... "
                 else:
                     prompt = "phyton>>> "
 
                 line = input(prompt)
+                stripped = line.strip()
 
-                if line.strip().lower() in ['exit()', 'quit()', 'exit', 'quit']:
+                if stripped and stripped.lower() in _EXIT_TOKENS:
                     print("Goodbye from Phyton! 🌿")
                     break
 
                 # Check if we need to continue reading (line ends with : or is indented)
-                if line.strip():
-                    multi_line_buffer.append(line)
-
-                    # If line ends with : or next line starts with whitespace, continue
-                    if line.rstrip().endswith(':') or \
-                        (multi_line_buffer and line.startswith(('    ', '\t'))):
+                if stripped:
+                    if multi_line_count:
+                        multi_line_buffer.write('\n')
+                    multi_line_buffer.write(line)
+                    multi_line_count += 1
+
+                    # If line ends with : or is indented, keep reading the block
+                    if stripped.endswith(':') or line[:1] in (' ', '\t'):
                         continue
 
                 # Execute the buffered code
-                if multi_line_buffer:
-                    code = '\n'.join(multi_line_buffer)
+                if multi_line_count:
+                    code = multi_line_buffer.getvalue()
+                    multi_line_buffer = io.StringIO()
+                    multi_line_count = 0
                     self.execute(code)
-                    multi_line_buffer = []
-                elif line.strip():
+                elif stripped:
                     self.execute(line)
 
             except KeyboardInterrupt:
                 print("\nKeyboardInterrupt")
-                multi_line_buffer = []
+                multi_line_buffer = io.StringIO()
+                multi_line_count = 0
             except EOFError:
                 print("\nGoodbye from Phyton! 🌿")
                 break
 
-def main():
-    """Main entry point for Phyton interpreter."""
+def main(argv=None):
+    """
+    Main entry point for Phyton interpreter.
+
+    Args:
+        argv (list): Command line arguments without the program name.
+                    Defaults to sys.argv[1:].
+    """
     try:
         # Parse command line arguments with misspelling correction
         arg_parser = PhytonArgumentParser()
-        args = arg_parser.parse_args()
+        args = arg_parser.parse_args(argv)
 
         # Fuzzy matching is disabled by default, enabled with --fuzzy
         fuzzy_enabled = args.fuzzy
@@ -491,8 +811,7 @@ def main():
                 print(f"Warning: Expected .phy file, got {filename}")
 
             try:
-                with open(filename, 'r', encoding='utf-8') as f:
-                    code = f.read()
+                code = _read_source(filename)
                 interpreter.execute(code)
             except FileNotFoundError:
                 print(f"PhytonError: File '{filename}' not found")
@@ -6,120 +6,322 @@ Tests keyword mapping, fuzzy matching, argument parsing, error handling, and cov
 
 import subprocess
 import os
+import signal
 import sys
-import tempfile
 import unittest.mock
 import stat
 import contextlib
 import io
+import re
+from pathlib import Path
 import pytest
 import phyton
 
+# pylint: disable=too-many-lines,redefined-outer-name
+
+
+# Corrected forms shared by several keyword mapping cases
+DEF_BODY = 'def hello():\n    pass'
+IF_BODY = 'if True:\n    pass'
+ELIF_BODY = 'elif True:\n    pass'
+ELSE_BODY = 'else:\n    pass'
+FOR_BODY = 'for i in range(3):\n    pass'
+WHILE_BODY = 'while True:\n    pass'
+CLASS_BODY = 'class Test:\n    pass'
+
+KEYWORD_CASES = (
+    # def variations
+    ('deff hello():\n    pass', DEF_BODY),
+    ('define hello():\n    pass', DEF_BODY),
+    ('defin hello():\n    pass', DEF_BODY),
+    # if/elif/else variations
+    ('iff True:\n    pass', IF_BODY),
+    ('iif True:\n    pass', IF_BODY),
+    ('elsif True:\n    pass', ELIF_BODY),
+    ('elseif True:\n    pass', ELIF_BODY),
+    ('els:\n    pass', ELSE_BODY),
+    ('elze:\n    pass', ELSE_BODY),
+    # loop variations
+    ('fore i inn range(3):\n    pass', FOR_BODY),
+    ('four i inn range(3):\n    pass', FOR_BODY),
+    ('wile True:\n    pass', WHILE_BODY),
+    ('whyle True:\n    pass', WHILE_BODY),
+    # other keywords
+    ('retrun 5', 'return 5'),
+    ('retrn 5', 'return 5'),
+    ('imprt os', 'import os'),
+    ('imort os', 'import os'),
+    ('frm os imprt path', 'from os import path'),
+    ('klass Test:\n    pass', CLASS_BODY),
+    ('clas Test:\n    pass', CLASS_BODY),
+    # boolean and None
+    ('x = true', 'x = True'),
+    ('x = false', 'x = False'),
+    ('x = none', 'x = None'),
+    ('x = null', 'x = None'),
+    ('x = nil', 'x = None'),
+    # print variations
+    ('prin("hello")', 'print("hello")'),
+    ('prnt("hello")', 'print("hello")'),
+    ('pritn("hello")', 'print("hello")'),
+    # logical operators
+    ('x andd y', 'x and y'),
+    ('x adn y', 'x and y'),
+    ('x orr y', 'x or y'),
+    ('nott x', 'not x'),
+    ('no x', 'not x'),
+)
+
+FUZZY_CASES = (
+    ('defff hello():', 'def hello():'),
+    ('printt("hello")', 'print("hello")'),
+    ('prrint("hello")', 'print("hello")'),
+    ('returnn 5', 'return 5'),
+    ('printt("defff")', 'print("defff")'),
+)
+
+# Only runs once its misspellings are fuzzy matched
+FUZZY_SRC = '''
+defff hello():
+    printt("This needs fuzzy!")
 
-class TestPhytonFeatures:  # pylint: disable=too-many-public-methods
-    """Main test class for all Phyton functionality."""
+hello()
+'''
 
-    def run_phyton_command(self, args, input_text=None, timeout=10):
-        """Run a phyton command and return output."""
+# (fuzzy matching, source, expected output, whether it reports an error)
+EXECUTION_CASES = (
+    pytest.param(False, 'def hello():\n    print("Hello from normal Python!")\n\nhello()\n',
+                 'Hello from normal Python!', False, id='normal'),
+    pytest.param(False, 'deff hello():\n    prin("Hello from Phyton!")\n\nhello()\n',
+                 'Hello from Phyton!', False, id='misspelled'),
+    pytest.param(False, FUZZY_SRC, 'SyntaxError', True, id='fuzzy-without-flag'),
+    pytest.param(True, FUZZY_SRC, 'This needs fuzzy!', False, id='fuzzy-with-flag'),
+    pytest.param(False, 'deff hello(\n    prin("missing colon and parenthesis")\n',
+                 'SyntaxError', True, id='syntax-error'),
+    pytest.param(False, 'prin(undefined_variable)\n', 'PhytonNameError', True,
+                 id='name-error'),
+)
+
+# Input files main() only reads, keyed by name: (file name, contents)
+PHY_FIXTURES = {
+    'fuzzy_needed': ('fuzzy.phy', FUZZY_SRC.encode('utf-8')),
+    'not_phy': ('script.py', b"print('test')"),
+    'binary': ('binary.phy', b'\x80\x81\x82'),  # Invalid UTF-8
+    'bad_unicode': ('bad_unicode.phy', b'\xff\xfe\x00\x00invalid unicode'),
+    'syntax_error': ('syntax_error.phy', b'deff hello(\n    prin("missing colon")\n'),
+}
+
+
+# Checked once at import rather than by every launcher test's skipif
+_HAS_LAUNCHER = Path('./phyton').is_file()
+
+
+def _assert_never_executed(interpreter):
+    """Fail a shared interpreter's teardown if any test ran code in its globals."""
+    user_globals = interpreter._user_globals  # pylint: disable=protected-access
+    assert set(user_globals) == {'__builtins__', '__name__', '__doc__'}, \
+        "execute() on a shared interpreter; use mut_interp instead"
+
+
+@pytest.fixture(scope="module")
+def interp():
+    """Shared interpreter with fuzzy matching disabled, for fix_spelling-style checks only."""
+    interpreter = phyton.PhytonInterpreter(fuzzy_matching=False, verbose=False)
+    yield interpreter
+    _assert_never_executed(interpreter)
+
+
+@pytest.fixture(scope="module")
+def interp_fuzzy():
+    """Shared interpreter with fuzzy matching enabled, for fix_spelling-style checks only."""
+    interpreter = phyton.PhytonInterpreter(fuzzy_matching=True, verbose=False)
+    yield interpreter
+    _assert_never_executed(interpreter)
+
+
+def _kill_process_group(process):
+    """Stop process and everything it started: SIGTERM, then SIGKILL after 2s."""
+    try:
+        os.killpg(process.pid, signal.SIGTERM)
         try:
-            cmd = ['python3', 'phyton.py'] + args
-            result = subprocess.run(
-                cmd,
-                input=input_text,
-                text=True,
-                capture_output=True,
-                timeout=timeout,
-                check=False
-            )
-            return result.stdout + result.stderr, result.returncode
+            process.communicate(timeout=2)
+            return
         except subprocess.TimeoutExpired:
-            return "TIMEOUT", -1
-        except OSError as error:
-            return f"ERROR: {error}", -1
-
-    def create_temp_file(self, content, suffix='.phy'):
-        """Create a temporary file with given content."""
-        file_descriptor, path = tempfile.mkstemp(suffix=suffix)
+            os.killpg(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass  # The whole group has already exited
+    process.communicate()
+
+
+def _run_process(command, input_text=None, timeout=10):
+    """
+    Run command in its own process group and return the CompletedProcess.
+
+    stdin is closed once input_text is written (or straight away when there is
+    none), so the REPL sees EOF instead of waiting on the test runner's stdin.
+    If the run is cut short (this call's timeout, pytest-timeout's global
+    limit or Ctrl-C) the whole group is stopped, including the python child
+    the ./phyton launcher starts, and the exception is re-raised.
+    """
+    stdin = subprocess.DEVNULL if input_text is None else subprocess.PIPE
+    with subprocess.Popen(command, stdin=stdin,
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                          text=True, start_new_session=True) as process:
         try:
-            with os.fdopen(file_descriptor, 'w', encoding='utf-8') as file_handle:
-                file_handle.write(content)
-            return path
-        except OSError:
-            os.close(file_descriptor)
+            stdout, stderr = process.communicate(input_text, timeout=timeout)
+        except BaseException:
+            _kill_process_group(process)
             raise
+    return subprocess.CompletedProcess(process.args, process.returncode, stdout, stderr)
+
+
+def _spawn_phyton(args, input_text=None):
+    """
+    Run phyton.py in a fresh interpreter and return the CompletedProcess.
+
+    Uses the interpreter running the tests; -I skips user site-packages and
+    PYTHON* environment variables but keeps site-packages, so an installed
+    rapidfuzz is still picked up.
+    """
+    return _run_process([sys.executable, '-I', 'phyton.py'] + args, input_text)
+
+
+@pytest.fixture(scope="session")
+def help_result():
+    """Result of one `phyton.py --help` run, shared by every test that checks it."""
+    return _spawn_phyton(['--help'])
+
+
+@pytest.fixture(scope="session")
+def phy_fixtures(tmp_path_factory):
+    """Paths to every PHY_FIXTURES file, written once per session."""
+    directory = tmp_path_factory.mktemp("src")
+    paths = {}
+    for name, (file_name, contents) in PHY_FIXTURES.items():
+        path = directory / file_name
+        path.write_bytes(contents)
+        paths[name] = str(path)
+    return paths
+
+
+@pytest.fixture
+def mut_interp():
+    """Fresh interpreter for tests that execute code or add keywords or misspellings."""
+    return phyton.PhytonInterpreter(verbose=False)
+
+
+class TestPhytonFeatures:  # pylint: disable=too-many-public-methods
+    """Main test class for all Phyton functionality."""
+
+    def run_phyton_command(self, args, input_text=None):
+        """Run phyton.main() in-process and return its output and exit code."""
+        output_buffer = io.StringIO()
+        with unittest.mock.patch.object(sys, 'stdin', io.StringIO(input_text or '')), \
+                contextlib.redirect_stdout(output_buffer), \
+                contextlib.redirect_stderr(output_buffer):
+            try:
+                phyton.main(args)
+                code = 0
+            except SystemExit as error:
+                code = error.code or 0
+        return output_buffer.getvalue(), code
+
+    def run_code(self, interpreter, code):
+        """Execute code with the given interpreter and return what it printed."""
+        output_buffer = io.StringIO()
+        with contextlib.redirect_stdout(output_buffer):
+            interpreter.execute(code)
+        return output_buffer.getvalue()
 
     # Keyword Mapping Tests
-    @pytest.mark.parametrize("input_code,expected", [
-        # def variations
-        ('deff hello():\n    pass', 'def hello():\n    pass'),
-        ('define hello():\n    pass', 'def hello():\n    pass'),
-        ('defin hello():\n    pass', 'def hello():\n    pass'),
-        # if/elif/else variations
-        ('iff True:\n    pass', 'if True:\n    pass'),
-        ('iif True:\n    pass', 'if True:\n    pass'),
-        ('elsif True:\n    pass', 'elif True:\n    pass'),
-        ('elseif True:\n    pass', 'elif True:\n    pass'),
-        ('els:\n    pass', 'else:\n    pass'),
-        ('elze:\n    pass', 'else:\n    pass'),
-        # loop variations
-        ('fore i inn range(3):\n    pass', 'for i in range(3):\n    pass'),
-        ('four i inn range(3):\n    pass', 'for i in range(3):\n    pass'),
-        ('wile True:\n    pass', 'while True:\n    pass'),
-        ('whyle True:\n    pass', 'while True:\n    pass'),
-        # other keywords
-        ('retrun 5', 'return 5'),
-        ('retrn 5', 'return 5'),
-        ('imprt os', 'import os'),
-        ('imort os', 'import os'),
-        ('frm os imprt path', 'from os import path'),
-        ('klass Test:\n    pass', 'class Test:\n    pass'),
-        ('clas Test:\n    pass', 'class Test:\n    pass'),
-        # boolean and None
-        ('x = true', 'x = True'),
-        ('x = false', 'x = False'),
-        ('x = none', 'x = None'),
-        ('x = null', 'x = None'),
-        ('x = nil', 'x = None'),
-        # print variations
-        ('prin("hello")', 'print("hello")'),
-        ('prnt("hello")', 'print("hello")'),
-        ('pritn("hello")', 'print("hello")'),
-        # logical operators
-        ('x andd y', 'x and y'),
-        ('x adn y', 'x and y'),
-        ('x orr y', 'x or y'),
-        ('nott x', 'not x'),
-        ('no x', 'not x'),
-    ])
-    def test_keyword_mappings(self, input_code, expected):
+    @pytest.mark.parametrize("input_code,expected", KEYWORD_CASES)
+    def test_keyword_mappings(self, interp, input_code, expected):
         """Test all predefined keyword mappings."""
-        interpreter = phyton.PhytonInterpreter(fuzzy_matching=False)
-        actual = interpreter.fix_spelling(input_code)
+        actual = interp.fix_spelling(input_code)
         assert actual == expected
 
+    def test_keyword_mappings_batched(self, interp):
+        """Test all keyword mapping cases fixed together in one source."""
+        separator = '\n# ---\n'
+        source = separator.join(input_code for input_code, _ in KEYWORD_CASES)
+        fixed_cases = interp.fix_spelling(source).split(separator)
+        assert fixed_cases == [expected for _, expected in KEYWORD_CASES]
+
+    def test_fix_spelling_leaves_shared_interpreters_unchanged(self, interp, interp_fuzzy):
+        """Test fix_spelling doesn't alter the state the shared fixtures rely on."""
+        for interpreter in (interp, interp_fuzzy):
+            mappings = interpreter.keyword_mappings
+            lookup = dict(interpreter._lookup)  # pylint: disable=protected-access
+            interpreter.fix_spelling('deff f(): retrun printt(x) or nott defff')
+            assert interpreter.keyword_mappings is mappings
+            assert interpreter._lookup == lookup  # pylint: disable=protected-access
+
+    def test_single_pass_matches_per_word_substitution(self, interp):
+        """Test the single-pass fixer agrees with one re.sub per misspelling."""
+        def per_word_fix(code):
+            for correct, misspellings in interp.keyword_mappings.items():
+                for misspelling in misspellings:
+                    if misspelling != correct:
+                        code = re.sub(r'\b' + re.escape(misspelling) + r'\b', correct, code)
+            return code
+
+        words = [m for ms in interp.keyword_mappings.values() for m in ms]
+        corpus = [' '.join(words), '\n'.join(f'x.{word}(y, {word}_z, z_{word})' for word in words)]
+        for code in corpus:
+            assert interp.fix_spelling(code) == per_word_fix(code)
+
     # Fuzzy Matching Tests
-    @pytest.mark.parametrize("input_code,expected", [
-        ('defff hello():', 'def hello():'),
-        ('printt("hello")', 'print("hello")'),
-        ('prrint("hello")', 'print("hello")'),
-        ('returnn 5', 'return 5'),
-    ])
-    def test_fuzzy_matching_enabled(self, input_code, expected):
+    @pytest.mark.parametrize("input_code,expected", FUZZY_CASES)
+    def test_fuzzy_matching_enabled(self, interp_fuzzy, input_code, expected):
         """Test fuzzy matching functionality when enabled."""
-        interpreter_fuzzy = phyton.PhytonInterpreter(fuzzy_matching=True)
-        fuzzy_result = interpreter_fuzzy.fix_spelling(input_code)
+        fuzzy_result = interp_fuzzy.fix_spelling(input_code)
         assert fuzzy_result == expected
 
+    @pytest.mark.parametrize("backend", ['indel', 'rapidfuzz'])
+    def test_fuzzy_matching_on_each_backend(self, monkeypatch, backend):
+        """Test the fuzzy cases give the same fixes with and without rapidfuzz."""
+        if backend == 'rapidfuzz':
+            rapidfuzz = pytest.importorskip('rapidfuzz')
+            monkeypatch.setattr(phyton, 'fuzz', rapidfuzz.fuzz)
+            monkeypatch.setattr(phyton, 'fuzz_process', rapidfuzz.process)
+        else:
+            monkeypatch.setattr(phyton, 'fuzz_process', None)
+        # A fresh interpreter, since fuzzy results are cached per instance
+        interpreter = phyton.PhytonInterpreter(fuzzy_matching=True, verbose=False)
+        fixed = [interpreter.fix_spelling(input_code) for input_code, _ in FUZZY_CASES]
+        assert fixed == [expected for _, expected in FUZZY_CASES]
+
+    def test_fuzzy_backends_agree_on_case_and_punctuation(self, monkeypatch):
+        """Test rapidfuzz and the fallback agree where normalizing would differ."""
+        pytest.importorskip('rapidfuzz')
+        words = ['Deff', 'PRINT', 'Ture', 'fasle', 'NONEE', 'else_iff', 'elseif_',
+                 'else_f', 'retrn_', 'whyle', 'x', 'deffffff', 'xyz_unknown_word']
+        with_rapidfuzz = [phyton.PhytonInterpreter(fuzzy_matching=True, verbose=False)
+                          .find_fuzzy_match(word) for word in words]
+        monkeypatch.setattr(phyton, 'fuzz_process', None)
+        without = [phyton.PhytonInterpreter(fuzzy_matching=True, verbose=False)
+                   .find_fuzzy_match(word) for word in words]
+        assert without == with_rapidfuzz
+
+    def test_closest_match_rapidfuzz_call(self, monkeypatch):
+        """Test rapidfuzz is asked for an unprocessed ratio above the cutoff."""
+        stub = unittest.mock.Mock()
+        stub.extractOne.return_value = ('print', 90.0, 0)
+        monkeypatch.setattr(phyton, 'fuzz', unittest.mock.Mock())
+        monkeypatch.setattr(phyton, 'fuzz_process', stub)
+        assert phyton._closest_match('printt', ['print'], 0.8) == 'print'  # pylint: disable=protected-access
+        stub.extractOne.assert_called_once_with('printt', ['print'], scorer=phyton.fuzz.ratio,
+                                                processor=None, score_cutoff=80.0)
+
     @pytest.mark.parametrize("input_code", [
         'defff hello():',
         'printt("hello")',
         'prrint("hello")',
         'returnn 5',
     ])
-    def test_fuzzy_matching_disabled(self, input_code):
+    def test_fuzzy_matching_disabled(self, interp, input_code):
         """Test fuzzy matching functionality when disabled."""
-        interpreter_normal = phyton.PhytonInterpreter(fuzzy_matching=False)
-        normal_result = interpreter_normal.fix_spelling(input_code)
+        normal_result = interp.fix_spelling(input_code)
         assert normal_result == input_code
 
     @pytest.mark.parametrize("case", [
@@ -127,10 +329,9 @@ class TestPhytonFeatures:  # pylint: disable=too-many-public-methods
         'deffffff',  # Too many extra letters
         'a',  # Too short
     ])
-    def test_fuzzy_edge_cases(self, case):
+    def test_fuzzy_edge_cases(self, interp_fuzzy, case):
         """Test edge cases that shouldn't match in fuzzy mode."""
-        interpreter_fuzzy = phyton.PhytonInterpreter(fuzzy_matching=True)
-        result = interpreter_fuzzy.fix_spelling(case)
+        result = interp_fuzzy.fix_spelling(case)
         assert result == case
 
     # Argument Parsing Tests
@@ -148,119 +349,28 @@ class TestPhytonFeatures:  # pylint: disable=too-many-public-methods
         assert 'Phyton - A Python interpreter' in output
 
     @pytest.mark.parametrize("option", ['--fuzy', '--fuzz', '--fuzi', '--fzzy'])
-    def test_misspelled_fuzzy_options(self, option):
+    def test_misspelled_fuzzy_options(self, option, phy_fixtures):
         """Test misspelled fuzzy options are corrected and work."""
-        test_content = 'printt("test")'
-        temp_file = self.create_temp_file(test_content)
-        try:
-            output, _ = self.run_phyton_command([option, temp_file])
-            assert '🔧 Fixed option:' in output
-            assert 'fuzzy match' in output
-        finally:
-            os.unlink(temp_file)
+        output, _ = self.run_phyton_command([option, phy_fixtures['fuzzy_needed']])
+        assert '🔧 Fixed option:' in output
+        assert 'fuzzy match' in output
 
     @pytest.mark.parametrize("option", ['--interactiv', '--intractiv', '--interact'])
     def test_misspelled_interactive_options(self, option):
         """Test misspelled interactive options are corrected."""
-        output, _ = self.run_phyton_command([option], input_text="quit()\n", timeout=5)
+        output, _ = self.run_phyton_command([option], input_text="quit()\n")
         assert '🔧 Fixed option:' in output
         assert 'Welcome to Phyton' in output
 
-    # File Execution Tests
-    def test_normal_python_execution(self):
-        """Test normal Python code executes correctly."""
-        python_code = '''
-def hello():
-    print("Hello from normal Python!")
-
-hello()
-'''
-        temp_file = self.create_temp_file(python_code)
-        try:
-            output, code = self.run_phyton_command([temp_file])
-            assert "Hello from normal Python!" in output
-            assert code == 0
-        finally:
-            os.unlink(temp_file)
-
-    def test_phyton_code_execution(self):
-        """Test Phyton code with misspellings executes correctly."""
-        phyton_code = '''
-deff hello():
-    prin("Hello from Phyton!")
-
-hello()
-'''
-        temp_file = self.create_temp_file(phyton_code)
-        try:
-            output, code = self.run_phyton_command([temp_file])
-            assert "Hello from Phyton!" in output
-            assert code == 0
-        finally:
-            os.unlink(temp_file)
-
-    def test_fuzzy_required_code_without_flag(self):
-        """Test code requiring fuzzy matching fails without --fuzzy."""
-        fuzzy_code = '''
-defff hello():
-    printt("This needs fuzzy!")
-
-hello()
-'''
-        temp_file = self.create_temp_file(fuzzy_code)
-        try:
-            output, _ = self.run_phyton_command([temp_file])
-            assert ("SyntaxError" in output or "PhytonSyntaxError" in output)
-        finally:
-            os.unlink(temp_file)
-
-    def test_fuzzy_required_code_with_flag(self):
-        """Test code requiring fuzzy matching works with --fuzzy."""
-        fuzzy_code = '''
-defff hello():
-    printt("This needs fuzzy!")
-
-hello()
-'''
-        temp_file = self.create_temp_file(fuzzy_code)
-        try:
-            output, code = self.run_phyton_command(['--fuzzy', temp_file])
-            assert "This needs fuzzy!" in output
-            assert code == 0
-        finally:
-            os.unlink(temp_file)
-
-    # Error Handling Tests
-    def test_syntax_error_handling(self):
-        """Test syntax errors are reported with Phyton branding."""
-        syntax_error_code = '''
-deff hello(
-    prin("missing colon and parenthesis")
-'''
-        temp_file = self.create_temp_file(syntax_error_code)
-        try:
-            output, _ = self.run_phyton_command([temp_file])
-            assert ("PhytonSyntaxError" in output or "SyntaxError" in output)
-        finally:
-            os.unlink(temp_file)
-
-    def test_file_not_found_error(self):
-        """Test file not found errors are handled gracefully."""
-        output, _ = self.run_phyton_command(['nonexistent_file.phy'])
-        assert "PhytonError" in output
-        assert "not found" in output
-
-    def test_name_error_handling(self):
-        """Test name errors are reported with Phyton branding."""
-        name_error_code = '''
-prin(undefined_variable)
-'''
-        temp_file = self.create_temp_file(name_error_code)
-        try:
-            output, _ = self.run_phyton_command([temp_file])
-            assert "PhytonNameError" in output
-        finally:
-            os.unlink(temp_file)
+    # Code Execution Tests
+    @pytest.mark.parametrize("fuzzy,code,expected,fails", EXECUTION_CASES)
+    def test_code_execution(self, fuzzy, code, expected, fails):
+        """Test execution output and Phyton-branded errors for each case."""
+        # A fresh interpreter, so no earlier test's globals leak into the run
+        interpreter = phyton.PhytonInterpreter(fuzzy_matching=fuzzy, verbose=False)
+        output = self.run_code(interpreter, code)
+        assert expected in output
+        assert ("Error" in output) == fails
 
     # Interactive Mode Tests
     def test_interactive_mode_basic(self):
@@ -272,8 +382,7 @@ deff test():
 prin(test())
 quit()
 '''
-        output, _ = self.run_phyton_command(['--interactive'],
-                                          input_text=interactive_input, timeout=10)
+        output, _ = self.run_phyton_command(['--interactive'], input_text=interactive_input)
         assert "Welcome to Phyton" in output
         assert "success" in output
 
@@ -287,72 +396,81 @@ test()
 quit()
 '''
         output, _ = self.run_phyton_command(['--fuzzy', '--interactive'],
-                                          input_text=fuzzy_interactive, timeout=10)
+                                            input_text=fuzzy_interactive)
         assert "fuzzy match" in output
         assert "fuzzy success" in output
 
     # Edge Case Tests
-    def test_empty_input(self):
+    def test_empty_input(self, interp):
         """Test empty input is handled correctly."""
-        interpreter = phyton.PhytonInterpreter()
-        result = interpreter.fix_spelling("")
+        result = interp.fix_spelling("")
         assert result == ""
 
-    def test_whitespace_only_input(self):
+    def test_whitespace_only_input(self, interp):
         """Test whitespace-only input is preserved."""
-        interpreter = phyton.PhytonInterpreter()
-        result = interpreter.fix_spelling("   \n\t  ")
+        result = interp.fix_spelling("   \n\t  ")
         assert result == "   \n\t  "
 
-    def test_comments_preserved(self):
+    def test_comments_preserved(self, interp):
         """Test comments are preserved correctly."""
-        interpreter = phyton.PhytonInterpreter()
         comment_code = "# This is just a comment\n# Another comment"
-        result = interpreter.fix_spelling(comment_code)
+        result = interp.fix_spelling(comment_code)
         assert result == comment_code
 
-    def test_keywords_in_strings_modified(self):
-        """Test keywords in strings are modified (current behavior)."""
-        interpreter = phyton.PhytonInterpreter()
-        string_code = 'print("deff is not a function here")'
-        result = interpreter.fix_spelling(string_code)
-        expected = 'print("def is not a function here")'
-        assert result == expected
-
-    def test_case_preservation(self):
+    @pytest.mark.parametrize("literal", [
+        '"deff is not a function here"',
+        'f"deff is not a function here"',
+        'f"{nil} is not None here"',
+        'rf"{deff!r} {nott:>{retrun}}"',
+        'f"""{prin}\n{nil}"""',
+    ])
+    def test_keywords_in_strings_preserved(self, interp, literal):
+        """Test keywords in strings, f-strings included, are left untouched."""
+        result = interp.fix_spelling(f'prin({literal})')
+        assert result == f'print({literal})'
+
+    @pytest.mark.parametrize("fixture", ['interp', 'interp_fuzzy'])
+    def test_fstring_fields_left_untouched(self, request, fixture):
+        """Test names in f-string replacement fields are kept on every Python version."""
+        code = 'prin(f"{nil} {deff!r:>{nott}}")\nx = nil'
+        result = request.getfixturevalue(fixture).fix_spelling(code)
+        assert result == 'print(f"{nil} {deff!r:>{nott}}")\nx = None'
+
+    def test_keywords_in_comments_preserved(self, interp):
+        """Test misspellings inside comments are left untouched."""
+        code = "x = nil  # nil means none\n\tprin(x)"
+        result = interp.fix_spelling("iff True:\n\t" + code)
+        assert result == "if True:\n\tx = None  # nil means none\n\tprint(x)"
+
+    def test_untokenizable_code_still_fixed(self, interp):
+        """Test code with unbalanced brackets falls back to regex fixing."""
+        code = 'deff hello(\n    prin("missing paren"'
+        result = interp.fix_spelling(code)
+        assert result == 'def hello(\n    print("missing paren"'
+
+    def test_case_preservation(self, interp):
         """Test case preservation in mixed case."""
-        interpreter = phyton.PhytonInterpreter()
         mixed_case = "DEFF hello():\n    PRIN('test')"
-        result = interpreter.fix_spelling(mixed_case)
+        result = interp.fix_spelling(mixed_case)
         assert "DEFF" in result
 
-    def test_very_long_misspellings_ignored(self):
+    def test_very_long_misspellings_ignored(self, interp_fuzzy):
         """Test very long misspellings are not matched."""
-        interpreter_fuzzy = phyton.PhytonInterpreter(fuzzy_matching=True)
         long_misspelling = "deffffffffffffff"
-        result = interpreter_fuzzy.fix_spelling(long_misspelling)
+        result = interp_fuzzy.fix_spelling(long_misspelling)
         assert result == long_misspelling
 
-    @pytest.mark.skipif(not os.path.exists('./phyton'), reason="Launcher script not found")
-    def test_launcher_script_help(self):
-        """Test launcher script shows help correctly."""
-        try:
-            result = subprocess.run(['./phyton', '--help'], capture_output=True,
-                                  text=True, timeout=10, check=False)
-            assert 'Phyton - A Python interpreter' in result.stdout
-            assert result.returncode == 0
-        except (subprocess.TimeoutExpired, OSError):
-            pytest.fail("Launcher script help failed")
-
-    @pytest.mark.skipif(not os.path.exists('./phyton'), reason="Launcher script not found")
-    def test_launcher_script_misspelled_options(self):
-        """Test launcher script handles misspelled options."""
-        try:
-            result = subprocess.run(['./phyton', '--halp'], capture_output=True,
-                                  text=True, timeout=10, check=False)
-            assert '🔧 Fixed option:' in result.stdout + result.stderr
-        except (subprocess.TimeoutExpired, OSError):
-            pytest.fail("Launcher script misspelled option test failed")
+    @pytest.mark.integration
+    @pytest.mark.skipif(not _HAS_LAUNCHER, reason="Launcher script not found")
+    @pytest.mark.parametrize("option,expected", [
+        ('--help', 'Phyton - A Python interpreter'),
+        ('--halp', '🔧 Fixed option:'),
+    ], ids=['help', 'misspelled-help'])
+    def test_launcher_script(self, option, expected):
+        """Test launcher script shows help and fixes misspelled options."""
+        result = _run_process(['./phyton', option])
+        assert expected in result.stdout
+        assert result.returncode == 0
 
     # Argument Parser Tests
     def test_argument_parser_initialization(self):
@@ -432,503 +550,481 @@ quit()
         assert not args.fuzzy
         assert not args.interactive
 
-    def test_parse_args_with_none(self):
+    def test_parse_args_with_none(self, monkeypatch, capsys):
         """Test parse_args method with None (uses sys.argv)."""
         parser = phyton.PhytonArgumentParser()
-        # Save original sys.argv
-        original_argv = sys.argv.copy()
-        try:
-            # Simulate command line args
-            sys.argv = ['phyton.py', '--help']
-            # This will raise SystemExit due to --help, which is expected
-            try:
-                parser.parse_args(None)
-            except SystemExit:
-                pass  # Expected behavior for --help
-        finally:
-            sys.argv = original_argv
+        # Simulate command line args; monkeypatch restores sys.argv afterwards
+        monkeypatch.setattr(sys, 'argv', ['phyton.py', '--help'])
+        # --help prints usage and exits, which is expected
+        with pytest.raises(SystemExit) as exit_info:
+            parser.parse_args(None)
+        assert exit_info.value.code == 0
+        assert 'Phyton - A Python interpreter' in capsys.readouterr().out
 
     def test_option_mapping_coverage(self):
         """Test all option mappings are covered."""
         parser = phyton.PhytonArgumentParser()
+        pairs = [(correct, misspelling)
+                 for correct, misspellings in parser.option_mappings.items()
+                 for misspelling in misspellings]
 
-        # Test all known misspellings
-        for correct, misspellings in parser.option_mappings.items():
-            for misspelling in misspellings:
-                result = parser._find_option_match(misspelling)  # pylint: disable=protected-access
-                assert result == correct
+        # Fix every known misspelling in one call and compare the whole batch
+        fixed = parser.fix_option_spelling([f'--{misspelling}' for _, misspelling in pairs])
+        assert fixed == [f'--{correct}' for correct, _ in pairs]
 
     # Interpreter Method Tests
-    def test_add_misspelling_existing_keyword(self):
+    def test_add_misspelling_existing_keyword(self, mut_interp):
         """Test adding misspelling to existing keyword."""
-        interpreter = phyton.PhytonInterpreter()
-        success = interpreter.add_misspelling('def', 'newdef')
+        success = mut_interp.add_misspelling('def', 'newdef')
         assert success is True
-        assert 'newdef' in interpreter.keyword_mappings['def']
-
-    def test_add_misspelling_nonexistent_keyword(self):
+        assert 'newdef' in mut_interp.keyword_mappings['def']
+
+    def test_add_misspelling_applied_by_fix_spelling(self, mut_interp):
+        """Test added misspellings are picked up by fix_spelling."""
+        mut_interp.add_misspelling('def', 'dfe')
+        mut_interp.add_keyword('lambda', ['lamda'])
+        assert mut_interp.fix_spelling('dfe f(): retrun lamda: 1') == \
+            'def f(): return lambda: 1'
+
+    def test_fuzzy_match_results_are_cached(self, interp_fuzzy):
+        """Test repeated fuzzy lookups of a word are answered from the cache."""
+        cache_info = interp_fuzzy._cached_fuzzy_match.cache_info  # pylint: disable=protected-access
+        interp_fuzzy.find_fuzzy_match('retunr')
+        hits = cache_info().hits
+        assert interp_fuzzy.find_fuzzy_match('retunr') == 'return'
+        assert cache_info().hits == hits + 1
+
+    def test_added_keywords_reach_fuzzy_matching(self, mut_interp):
+        """Test fuzzy matching sees keywords and misspellings added later."""
+        mut_interp.fuzzy_matching = True
+        assert mut_interp.find_fuzzy_match('lambdaa') is None
+        mut_interp.add_keyword('lambda', ['lamda'])
+        assert mut_interp.find_fuzzy_match('lambdaa') == 'lambda'
+        assert mut_interp.find_fuzzy_match('lamdaa') == 'lambda'
+
+    def test_add_misspelling_does_not_leak_between_instances(self, mut_interp, interp):
+        """Test instances share defaults but keep additions to themselves."""
+        mut_interp.add_misspelling('def', 'dfe')
+        mut_interp.add_keyword('lambda', ['lamda'])
+        assert 'dfe' not in interp.get_misspellings('def')
+        assert 'lambda' not in interp.keyword_mappings
+        assert interp.fix_spelling('dfe') == 'dfe'
+
+    def test_default_mappings_are_read_only(self, interp):
+        """Test the shared defaults can't be changed through an instance."""
+        with pytest.raises(TypeError):
+            interp.keyword_mappings['lambda'] = ['lambda']
+        misspellings = interp.get_misspellings('def')
+        assert isinstance(misspellings, list)
+        misspellings.append('dfe')
+        assert 'dfe' not in interp.get_misspellings('def')
+
+    def test_add_misspelling_nonexistent_keyword(self, mut_interp):
         """Test adding misspelling to non-existent keyword."""
-        interpreter = phyton.PhytonInterpreter()
-        success = interpreter.add_misspelling('nonexistent', 'spelling')
+        success = mut_interp.add_misspelling('nonexistent', 'spelling')
         assert success is False
 
-    def test_add_misspelling_duplicate(self):
+    def test_add_misspelling_duplicate(self, mut_interp):
         """Test adding duplicate misspelling."""
-        interpreter = phyton.PhytonInterpreter()
-        interpreter.add_misspelling('def', 'deff')  # Already exists
+        mut_interp.add_misspelling('def', 'deff')  # Already exists
         # Should not duplicate
-        count = interpreter.keyword_mappings['def'].count('deff')
+        count = mut_interp.keyword_mappings['def'].count('deff')
         assert count == 1
 
-    def test_add_keyword_new(self):
+    def test_add_keyword_new(self, mut_interp):
         """Test adding a completely new keyword."""
-        interpreter = phyton.PhytonInterpreter()
-        interpreter.add_keyword('newkeyword', ['newkw', 'nkw'])
-        assert 'newkeyword' in interpreter.keyword_mappings
-        assert 'newkw' in interpreter.keyword_mappings['newkeyword']
+        mut_interp.add_keyword('newkeyword', ['newkw', 'nkw'])
+        assert 'newkeyword' in mut_interp.keyword_mappings
+        assert 'newkw' in mut_interp.keyword_mappings['newkeyword']
 
-    def test_add_keyword_with_none_misspellings(self):
+    def test_add_keyword_with_none_misspellings(self, mut_interp):
         """Test adding keyword with None misspellings."""
-        interpreter = phyton.PhytonInterpreter()
-        interpreter.add_keyword('testkw', None)
-        assert 'testkw' in interpreter.keyword_mappings
-        assert interpreter.keyword_mappings['testkw'] == ['testkw']
+        mut_interp.add_keyword('testkw', None)
+        assert 'testkw' in mut_interp.keyword_mappings
+        assert mut_interp.keyword_mappings['testkw'] == ['testkw']
 
-    def test_add_keyword_without_correct_in_list(self):
+    def test_add_keyword_without_correct_in_list(self, mut_interp):
         """Test adding keyword where correct spelling not in misspellings."""
-        interpreter = phyton.PhytonInterpreter()
-        interpreter.add_keyword('correct', ['wrong1', 'wrong2'])
-        assert interpreter.keyword_mappings['correct'][0] == 'correct'
+        mut_interp.add_keyword('correct', ['wrong1', 'wrong2'])
+        assert mut_interp.keyword_mappings['correct'][0] == 'correct'
 
-    def test_get_misspellings_existing(self):
+    def test_get_misspellings_existing(self, interp):
         """Test getting misspellings for existing keyword."""
-        interpreter = phyton.PhytonInterpreter()
-        misspellings = interpreter.get_misspellings('def')
+        misspellings = interp.get_misspellings('def')
         assert 'deff' in misspellings
         assert 'define' in misspellings
 
-    def test_get_misspellings_nonexistent(self):
+    def test_get_misspellings_nonexistent(self, interp):
         """Test getting misspellings for non-existent keyword."""
-        interpreter = phyton.PhytonInterpreter()
-        misspellings = interpreter.get_misspellings('nonexistent')
+        misspellings = interp.get_misspellings('nonexistent')
         assert misspellings == []
 
     # Fuzzy Matching Tests
-    def test_find_fuzzy_match_disabled(self):
+    def test_find_fuzzy_match_disabled(self, interp):
         """Test fuzzy matching when disabled."""
-        interpreter = phyton.PhytonInterpreter(fuzzy_matching=False)
-        result = interpreter.find_fuzzy_match('defff')
+        result = interp.find_fuzzy_match('defff')
         assert result is None
 
-    def test_find_fuzzy_match_enabled_good_match(self):
+    def test_find_fuzzy_match_enabled_good_match(self, interp_fuzzy):
         """Test fuzzy matching when enabled with good match."""
-        interpreter = phyton.PhytonInterpreter(fuzzy_matching=True)
-        result = interpreter.find_fuzzy_match('defff')
+        result = interp_fuzzy.find_fuzzy_match('defff')
         assert result == 'def'
 
-    def test_find_fuzzy_match_enabled_no_match(self):
+    def test_find_fuzzy_match_enabled_no_match(self, interp_fuzzy):
         """Test fuzzy matching when enabled with no good match."""
-        interpreter = phyton.PhytonInterpreter(fuzzy_matching=True)
-        result = interpreter.find_fuzzy_match('xyz123unknown')
+        result = interp_fuzzy.find_fuzzy_match('xyz123unknown')
         assert result is None
 
-    def test_adaptive_fuzzy_threshold_short_word(self):
+    def test_adaptive_fuzzy_threshold_short_word(self, interp_fuzzy):
         """Test adaptive fuzzy threshold for short words."""
-        interpreter = phyton.PhytonInterpreter(fuzzy_matching=True)
         # Short word should require higher threshold (90%)
-        result = interpreter.find_fuzzy_match('de')  # Too different from 'def'
+        result = interp_fuzzy.find_fuzzy_match('de')  # Too different from 'def'
         assert result is None
 
-    def test_adaptive_fuzzy_threshold_medium_word(self):
+    def test_adaptive_fuzzy_threshold_medium_word(self, interp_fuzzy):
         """Test adaptive fuzzy threshold for medium words."""
-        interpreter = phyton.PhytonInterpreter(fuzzy_matching=True)
         # Medium word should use 80% threshold
-        result = interpreter.find_fuzzy_match('printt')
+        result = interp_fuzzy.find_fuzzy_match('printt')
         assert result == 'print'
 
-    def test_adaptive_fuzzy_threshold_long_word(self):
+    def test_adaptive_fuzzy_threshold_long_word(self, interp_fuzzy):
         """Test adaptive fuzzy threshold for long words."""
-        interpreter = phyton.PhytonInterpreter(fuzzy_matching=True)
         # Long word should use 70% threshold
-        result = interpreter.find_fuzzy_match('exceptt')
+        result = interp_fuzzy.find_fuzzy_match('exceptt')
         assert result == 'except'
 
-    def test_fuzzy_threshold_boundary_conditions(self):
+    def test_fuzzy_threshold_boundary_conditions(self, interp_fuzzy):
         """Test fuzzy matching threshold boundary conditions."""
-        interpreter = phyton.PhytonInterpreter(fuzzy_matching=True)
-
         # These should work with fuzzy matching
-        assert interpreter.find_fuzzy_match("deff") == "def"  # Close to short word
-        assert interpreter.find_fuzzy_match("exceptt") == "except"  # Close to medium word
+        assert interp_fuzzy.find_fuzzy_match("deff") == "def"  # Close to short word
+        assert interp_fuzzy.find_fuzzy_match("exceptt") == "except"  # Close to medium word
 
-    def test_fuzzy_disabled_behavior(self):
+    def test_fuzzy_disabled_behavior(self, interp):
         """Test behavior when fuzzy matching is disabled."""
-        interpreter = phyton.PhytonInterpreter(fuzzy_matching=False)
-
         # Should not fix fuzzy matches
-        result = interpreter.fix_spelling('defff hello():')
+        result = interp.fix_spelling('defff hello():')
         assert 'defff' in result  # Should not be changed
 
+    @pytest.mark.parametrize("a,b,max_d,expected", [
+        ('def', 'def', 0, 0),
+        ('deff', 'def', 1, 1),
+        ('printt', 'print', 2, 1),
+        ('whiel', 'while', 2, 2),     # a swap is one delete plus one insert
+        ('whiel', 'while', 1, 2),     # over the bound reports max_d + 1
+        ('defff', 'def', 1, 2),       # length difference alone exceeds the bound
+        ('', 'pass', 4, 4),
+    ])
+    def test_indel_distance_leq(self, a, b, max_d, expected):
+        """Test the bounded edit distance used when rapidfuzz is not installed."""
+        for first, second in ((a, b), (b, a)):
+            distance = phyton._indel_distance_leq(first, second, max_d)  # pylint: disable=protected-access
+            assert distance == expected
+
     # Execute Method Tests
-    def test_execute_method_syntax_error(self):
+    def test_execute_method_syntax_error(self, mut_interp, capsys):
         """Test execute method with syntax error."""
-        interpreter = phyton.PhytonInterpreter()
-        captured_output = io.StringIO()
-        sys.stdout = captured_output
+        mut_interp.execute("invalid syntax here ::::")
+        output = capsys.readouterr().out
+        assert "PhytonSyntaxError" in output
 
-        try:
-            interpreter.execute("invalid syntax here ::::")
-            output = captured_output.getvalue()
-            assert "PhytonSyntaxError" in output
-        finally:
-            sys.stdout = sys.__stdout__
-
-    def test_execute_method_name_error(self):
+    def test_execute_method_name_error(self, mut_interp, capsys):
         """Test execute method with name error."""
-        interpreter = phyton.PhytonInterpreter()
-        captured_output = io.StringIO()
-        sys.stdout = captured_output
+        mut_interp.execute("undefined_variable")
+        output = capsys.readouterr().out
+        assert "PhytonNameError" in output
 
-        try:
-            interpreter.execute("undefined_variable")
-            output = captured_output.getvalue()
-            assert "PhytonNameError" in output
-        finally:
-            sys.stdout = sys.__stdout__
-
-    def test_execute_method_type_error(self):
+    def test_execute_method_type_error(self, mut_interp, capsys):
         """Test execute method with type error."""
-        interpreter = phyton.PhytonInterpreter()
-        captured_output = io.StringIO()
-        sys.stdout = captured_output
+        mut_interp.execute("len()")  # Missing argument
+        output = capsys.readouterr().out
+        assert "PhytonTypeError" in output
 
-        try:
-            interpreter.execute("len()")  # Missing argument
-            output = captured_output.getvalue()
-            assert "PhytonTypeError" in output
-        finally:
-            sys.stdout = sys.__stdout__
-
-    def test_execute_method_with_import_error(self):
+    def test_execute_method_with_import_error(self, mut_interp, capsys):
         """Test execute method with import error."""
-        interpreter = phyton.PhytonInterpreter()
-        captured_output = io.StringIO()
-        sys.stdout = captured_output
-
-        try:
-            interpreter.execute("import nonexistent_module_xyz")
-            output = captured_output.getvalue()
-            assert "PhytonImportError" in output
-        finally:
-            sys.stdout = sys.__stdout__
+        mut_interp.execute("import nonexistent_module_xyz")
+        output = capsys.readouterr().out
+        assert "PhytonImportError" in output
 
-    def test_execute_with_value_error(self):
+    def test_execute_with_value_error(self, mut_interp, capsys):
         """Test execute method with ValueError."""
-        interpreter = phyton.PhytonInterpreter()
-        captured_output = io.StringIO()
-        sys.stdout = captured_output
+        mut_interp.execute("int('not_a_number')")
+        output = capsys.readouterr().out
+        assert "PhytonValueError" in output
 
-        try:
-            interpreter.execute("int('not_a_number')")
-            output = captured_output.getvalue()
-            assert "PhytonValueError" in output
-        finally:
-            sys.stdout = sys.__stdout__
-
-    def test_execute_with_keyboard_interrupt(self):
+    def test_execute_with_keyboard_interrupt(self, mut_interp, capsys):
         """Test execute method with KeyboardInterrupt simulation."""
-        interpreter = phyton.PhytonInterpreter()
-        captured_output = io.StringIO()
-        sys.stdout = captured_output
-
-        try:
-            # Simulate KeyboardInterrupt by raising it in code
-            interpreter.execute("raise KeyboardInterrupt()")
-            output = captured_output.getvalue()
-            assert "PhytonKeyboardInterrupt" in output
-        finally:
-            sys.stdout = sys.__stdout__
+        # Simulate KeyboardInterrupt by raising it in code
+        mut_interp.execute("raise KeyboardInterrupt()")
+        output = capsys.readouterr().out
+        assert "PhytonKeyboardInterrupt" in output
 
-    def test_execute_with_unexpected_exception(self):
+    def test_execute_with_unexpected_exception(self, mut_interp, capsys):
         """Test execute method with unexpected exception."""
-        interpreter = phyton.PhytonInterpreter()
-        captured_output = io.StringIO()
-        sys.stdout = captured_output
+        # Create an unusual exception
+        mut_interp.execute("raise RuntimeError('Test unexpected error')")
+        output = capsys.readouterr().out
+        assert "PhytonUnexpectedError" in output
+        assert "RuntimeError" in output
 
-        try:
-            # Create an unusual exception
-            interpreter.execute("raise RuntimeError('Test unexpected error')")
-            output = captured_output.getvalue()
-            assert "PhytonUnexpectedError" in output
-            assert "RuntimeError" in output
-        finally:
-            sys.stdout = sys.__stdout__
-
-    def test_execute_successful_with_fixes(self):
+    def test_execute_successful_with_fixes(self, mut_interp):
         """Test execute method with successful code that needs fixes."""
-        interpreter = phyton.PhytonInterpreter()
-
         output_buffer = io.StringIO()
         with contextlib.redirect_stdout(output_buffer):
-            interpreter.execute('prin("Hello World")')
+            mut_interp.execute('prin("Hello World")')
 
         output = output_buffer.getvalue()
         assert "Hello World" in output
 
-    def test_execute_no_changes_needed(self):
+    def test_execute_fixed_spelling_shown_when_verbose(self, monkeypatch):
+        """Test the corrected code is only echoed in verbose mode."""
+        monkeypatch.delenv('PHYTON_DEBUG', raising=False)
+        quiet = phyton.PhytonInterpreter()
+        verbose = phyton.PhytonInterpreter(verbose=True)
+        monkeypatch.setenv('PHYTON_DEBUG', '1')
+        from_env = phyton.PhytonInterpreter()
+
+        for interpreter, expected in ((quiet, False), (verbose, True), (from_env, True)):
+            output_buffer = io.StringIO()
+            with contextlib.redirect_stdout(output_buffer):
+                interpreter.execute('prin("Hello World")')
+            output = output_buffer.getvalue()
+            assert "Hello World" in output
+            assert ("# Phyton: Fixed spelling -> print(" in output) is expected
+
+    def test_execute_no_changes_needed(self, mut_interp):
         """Test execute method when no spelling changes are needed."""
-        interpreter = phyton.PhytonInterpreter()
-
         output_buffer = io.StringIO()
         with contextlib.redirect_stdout(output_buffer):
-            interpreter.execute('x = 1 + 1')
+            mut_interp.execute('x = 1 + 1')
 
         # Should execute without spelling fix messages
         output = output_buffer.getvalue()
         assert "Fixed spelling" not in output
 
-    def test_execute_method_with_successful_code(self):
+    def test_execute_method_with_successful_code(self, mut_interp, capsys):
         """Test execute method with successful code execution."""
-        interpreter = phyton.PhytonInterpreter()
-
         # Capture stdout to verify execution
-        captured_output = io.StringIO()
-        sys.stdout = captured_output
-
-        try:
-            interpreter.execute("prin('success')")
-            output = captured_output.getvalue()
-            assert "success" in output
-        finally:
-            sys.stdout = sys.__stdout__
+        mut_interp.execute("prin('success')")
+        output = capsys.readouterr().out
+        assert "success" in output
 
-    def test_execute_method_no_spelling_fixes(self):
+    def test_execute_method_no_spelling_fixes(self, mut_interp, capsys):
         """Test execute method when no spelling fixes are needed."""
-        interpreter = phyton.PhytonInterpreter()
+        mut_interp.execute("print('correct spelling')")
+        output = capsys.readouterr().out
+        # Should not show "Fixed spelling" message
+        assert "Fixed spelling" not in output
+        assert "correct spelling" in output
 
-        captured_output = io.StringIO()
-        sys.stdout = captured_output
+    def test_execute_reuses_compiled_code(self, mut_interp):
+        """Test repeated sources are compiled only once."""
+        source = "prin('compiled once')"
 
-        try:
-            interpreter.execute("print('correct spelling')")
-            output = captured_output.getvalue()
-            # Should not show "Fixed spelling" message
-            assert "Fixed spelling" not in output
-            assert "correct spelling" in output
-        finally:
-            sys.stdout = sys.__stdout__
+        output_buffer = io.StringIO()
+        with contextlib.redirect_stdout(output_buffer):
+            mut_interp.execute(source)
+            hits = phyton._cached_compile.cache_info().hits  # pylint: disable=protected-access
+            mut_interp.execute(source)
+
+        assert phyton._cached_compile.cache_info().hits == hits + 1  # pylint: disable=protected-access
+        assert output_buffer.getvalue().splitlines().count('compiled once') == 2
+
+    def test_execute_does_not_cache_large_sources(self, mut_interp):
+        """Test sources over the size limit are compiled without being cached."""
+        source = "x = 1\n" * (phyton._MAX_CACHED_SOURCE // 6 + 1)  # pylint: disable=protected-access
+        cache_info = phyton._cached_compile.cache_info  # pylint: disable=protected-access
+
+        before = cache_info()
+        mut_interp.execute(source)
+        mut_interp.execute(source)
+
+        assert cache_info() == before
+
+    def test_execute_uses_own_namespace(self, mut_interp):
+        """Test user code runs in a namespace separate from Phyton's module."""
+        output_buffer = io.StringIO()
+        with contextlib.redirect_stdout(output_buffer):
+            mut_interp.execute("phyton_user_value = 42")
+            mut_interp.execute("prin(phyton_user_value, __name__)")
+            mut_interp.execute("prin(PhytonInterpreter)")
+
+        output = output_buffer.getvalue()
+        assert "42 __main__" in output
+        assert "PhytonNameError" in output
+        assert not hasattr(phyton, 'phyton_user_value')
 
     # Interactive Mode Tests
-    def test_interactive_mode_method_exists(self):
+    def test_interactive_mode_method_exists(self, interp):
         """Test interactive mode method exists."""
-        interpreter = phyton.PhytonInterpreter()
         # Test that interactive_mode method exists
-        assert hasattr(interpreter, 'interactive_mode')
+        assert hasattr(interp, 'interactive_mode')
+
+    def test_interactive_mode_multi_line_block(self, mut_interp):
+        """Test interactive mode buffers a block until the empty line."""
+        lines = ['fore i inn range(2):  ', ' prin(f"row {i}")', '', 'EXIT']
+
+        output_buffer = io.StringIO()
+        with unittest.mock.patch('builtins.input', side_effect=lines) as mock_input, \
+                contextlib.redirect_stdout(output_buffer):
+            mut_interp.interactive_mode()
+
+        prompts = [call.args[0] for call in mock_input.call_args_list]
+        assert prompts == ['phyton>>> ', 'phyton... ', 'phyton... ', 'phyton>>> ']
+        assert 'row 0\nrow 1' in output_buffer.getvalue()
+        assert 'Goodbye from Phyton!' in output_buffer.getvalue()
 
     # Main Function Tests
-    def test_main_function_help(self):
+    @pytest.mark.integration
+    def test_main_function_help(self, help_result):
         """Test main function with help argument."""
-        try:
-            result = subprocess.run(['python3', 'phyton.py', '--help'],
-                                  capture_output=True, text=True, timeout=10, check=False)
-            assert 'Phyton - A Python interpreter' in result.stdout
-            assert result.returncode == 0
-        except (subprocess.TimeoutExpired, OSError):
-            pytest.skip("Could not test main function")
-
-    def test_main_function_with_nonexistent_file(self):
+        assert 'Phyton - A Python interpreter' in help_result.stdout
+        assert help_result.returncode == 0
+
+    @pytest.mark.parametrize("args,fixture,expected", [
+        ([], 'syntax_error', 'PhytonSyntaxError'),
+        ([], 'fuzzy_needed', 'PhytonSyntaxError'),
+        (['--fuzzy'], 'fuzzy_needed', 'This needs fuzzy!'),
+    ])
+    def test_main_runs_file_from_argv(self, phy_fixtures, capsys, args, fixture, expected):
+        """Test main(argv) runs a file in-process and reports errors on stdout."""
+        phyton.main(args + [phy_fixtures[fixture]])
+        assert expected in capsys.readouterr().out
+
+    def test_main_function_with_nonexistent_file(self, monkeypatch, capsys):
         """Test main function with non-existent file."""
-        try:
-            result = subprocess.run(['python3', 'phyton.py', 'nonexistent_file_xyz.phy'],
-                                  capture_output=True, text=True, timeout=10, check=False)
-            # Check that error message is printed
-            assert "PhytonError" in result.stdout or "not found" in result.stdout
-        except (subprocess.TimeoutExpired, OSError):
-            pytest.skip("Could not test main function")
+        monkeypatch.setattr(sys, 'argv', ['phyton.py', 'nonexistent_file_xyz.phy'])
+        phyton.main()  # Reports the missing file and returns normally
+        # Check that error message is printed
+        captured = capsys.readouterr()
+        assert "PhytonError" in captured.out
+        assert "'nonexistent_file_xyz.phy' not found" in captured.out
 
     def test_main_function_interactive_mode(self):
         """Test main function in interactive mode."""
-        try:
-            result = subprocess.run(['python3', 'phyton.py', '--interactive'],
-                                  input="print('test')\nquit()\n",
-                                  capture_output=True, text=True, timeout=10, check=False)
-            assert 'Welcome to Phyton' in result.stdout or result.returncode == 0
-        except (subprocess.TimeoutExpired, OSError):
-            pytest.skip("Could not test main function interactive mode")
-
-    def test_main_function_permission_error(self):
-        """Test main function with permission error file."""
-        # Create a temporary file and remove read permissions
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.phy', delete=False) as temp_file:
-            temp_file.write("print('test')")
-            temp_file_name = temp_file.name
+        output, code = self.run_phyton_command(['--interactive'],
+                                               input_text="print('test')\nquit()\n")
+        assert 'Welcome to Phyton' in output
+        assert code == 0
 
+    def test_main_function_permission_error(self, tmp_path):
+        """Test main function with a file the filesystem really refuses to open."""
+        path = tmp_path / 'locked.phy'
+        path.write_text("print('test')", encoding='utf-8')
+
+        # Lock the directory rather than the file; restored so pytest can clean up
+        tmp_path.chmod(0)
         try:
-            # Remove read permissions
-            os.chmod(temp_file_name, stat.S_IWRITE)
-
-            result = subprocess.run(['python3', 'phyton.py', temp_file_name],
-                                  capture_output=True, text=True, timeout=10, check=False)
-            assert "Permission denied" in result.stdout or "PhytonError" in result.stdout
-        except (subprocess.TimeoutExpired, OSError, PermissionError):
-            pytest.skip("Could not test permission error")
+            if os.access(path, os.R_OK):
+                pytest.skip("File permissions are not enforced for this user (e.g. root)")
+            output, _ = self.run_phyton_command([str(path)])
         finally:
-            try:
-                os.chmod(temp_file_name, stat.S_IREAD | stat.S_IWRITE)
-                os.unlink(temp_file_name)
-            except OSError:
-                pass
+            tmp_path.chmod(stat.S_IRWXU)
 
-    def test_main_function_non_phy_file_warning(self):
-        """Test main function warning for non-.phy files."""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as temp_file:
-            temp_file.write("print('test')")
-            temp_file_name = temp_file.name
+        assert "PhytonError: Permission denied" in output
 
-        try:
-            result = subprocess.run(['python3', 'phyton.py', temp_file_name],
-                                  capture_output=True, text=True, timeout=10, check=False)
-            assert "Warning: Expected .phy file" in result.stdout or "test" in result.stdout
-        except (subprocess.TimeoutExpired, OSError):
-            pytest.skip("Could not test non-.phy file warning")
-        finally:
-            os.unlink(temp_file_name)
+    def test_main_function_permission_error_reported(self, phy_fixtures):
+        """Test the permission denied report without relying on file modes (runs as root too)."""
+        path = phy_fixtures['fuzzy_needed']
+        with unittest.mock.patch.object(phyton.os, 'open',
+                                        side_effect=PermissionError(13, 'Permission denied', path)):
+            output, code = self.run_phyton_command([path])
+        assert f"PhytonError: Permission denied reading file '{path}'" in output
+        assert code == 0
+
+    def test_main_function_non_phy_file_warning(self, phy_fixtures):
+        """Test main function warning for non-.phy files."""
+        output, _ = self.run_phyton_command([phy_fixtures['not_phy']])
+        assert "Warning: Expected .phy file" in output
+        assert "test" in output
 
     def test_main_function_keyboard_interrupt_handling(self):
         """Test main function keyboard interrupt handling."""
-        # This is difficult to test directly, but we can test the exception handling structure
-        try:
-            # Quick test with --help to ensure main function works
-            result = subprocess.run(['python3', 'phyton.py', '--help'],
-                                  capture_output=True, text=True, timeout=5, check=False)
-            assert result.returncode == 0
-        except (subprocess.TimeoutExpired, OSError):
-            pytest.skip("Could not test main function")
-
-    def test_main_function_scenarios(self):
+        with unittest.mock.patch.object(phyton.PhytonInterpreter, 'interactive_mode',
+                                        side_effect=KeyboardInterrupt):
+            output, code = self.run_phyton_command(['--interactive'])
+        assert 'Goodbye from Phyton!' in output
+        assert code == 0
+
+    def test_main_function_scenarios(self, phy_fixtures):
         """Test various main function scenarios."""
         # Test with binary file (will cause unicode decode error)
-        with tempfile.NamedTemporaryFile(mode='wb', suffix='.phy', delete=False) as binary_file:
-            binary_file.write(b'\x80\x81\x82')  # Invalid UTF-8
-            binary_file_name = binary_file.name
-
-        try:
-            result = subprocess.run(['python3', 'phyton.py', binary_file_name],
-                                  capture_output=True, text=True, timeout=5, check=False)
-            # Should handle unicode decode error gracefully
-            assert len(result.stdout) > 0 or len(result.stderr) > 0
-        except subprocess.TimeoutExpired:
-            pass
-        finally:
-            os.unlink(binary_file_name)
+        output, _ = self.run_phyton_command([phy_fixtures['binary']])
+        # Should handle unicode decode error gracefully
+        assert "PhytonError" in output
 
     def test_main_interactive_with_explicit_flag(self):
         """Test main function with explicit interactive flag."""
-        try:
-            # Use timeout to prevent hanging
-            result = subprocess.run(['python3', 'phyton.py', '--interactive'],
-                                  input='print("test")\\nquit()\\n',
-                                  capture_output=True, text=True, timeout=5, check=False)
-            # Should start interactive mode
-            assert len(result.stdout) > 0 or result.returncode is not None
-        except subprocess.TimeoutExpired:
-            pass  # Expected for interactive mode
+        output, code = self.run_phyton_command(['--interactive'],
+                                               input_text='print("test")\nquit()\n')
+        # Should start interactive mode
+        assert 'Welcome to Phyton' in output
+        assert code == 0
 
     def test_main_with_fuzzy_interactive(self):
         """Test main function with fuzzy flag in interactive mode."""
-        try:
-            result = subprocess.run(['python3', 'phyton.py', '--fuzzy', '--interactive'],
-                                  input='quit()\\n',
-                                  capture_output=True, text=True, timeout=5, check=False)
-            # Should enable fuzzy matching in interactive mode
-            assert len(result.stdout) > 0 or result.returncode is not None
-        except subprocess.TimeoutExpired:
-            pass
+        output, _ = self.run_phyton_command(['--fuzzy', '--interactive'], input_text='quit()\n')
+        # Should enable fuzzy matching in interactive mode
+        assert 'Fuzzy matching enabled' in output
 
-    def test_main_function_with_fuzzy_flag(self):
+    def test_main_function_with_fuzzy_flag(self, phy_fixtures):
         """Test main function with fuzzy flag enabled."""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.phy', delete=False) as temp_file:
-            temp_file.write("defff test(): printt('fuzzy test')")
-            temp_file_name = temp_file.name
-
-        try:
-            result = subprocess.run(['python3', 'phyton.py', '--fuzzy', temp_file_name],
-                                  capture_output=True, text=True, timeout=10, check=False)
-            assert "fuzzy match" in result.stdout or "test" in result.stdout
-        except (subprocess.TimeoutExpired, OSError):
-            pytest.skip("Could not test fuzzy flag")
-        finally:
-            os.unlink(temp_file_name)
+        output, _ = self.run_phyton_command(['--fuzzy', phy_fixtures['fuzzy_needed']])
+        assert "fuzzy match" in output
+        assert "This needs fuzzy!" in output
 
-    def test_main_function_unicode_decode_error(self):
+    def test_main_function_unicode_decode_error(self, phy_fixtures):
         """Test main function with unicode decode error."""
-        # Create a file with invalid UTF-8
-        with tempfile.NamedTemporaryFile(mode='wb', suffix='.phy', delete=False) as temp_file:
-            temp_file.write(b'\xff\xfe\x00\x00invalid unicode')
-            temp_file_name = temp_file.name
-
-        try:
-            result = subprocess.run(['python3', 'phyton.py', temp_file_name],
-                                  capture_output=True, text=True, timeout=10, check=False)
-            assert "PhytonError" in result.stdout or "decode" in result.stdout
-        except (subprocess.TimeoutExpired, OSError):
-            pytest.skip("Could not test unicode decode error")
-        finally:
-            os.unlink(temp_file_name)
-
-    def test_main_function_os_error(self):
-        """Test main function with OS error."""
-        # Try to read from a directory instead of a file
-        temp_dir = tempfile.mkdtemp()
-        try:
-            result = subprocess.run(['python3', 'phyton.py', temp_dir],
-                                  capture_output=True, text=True, timeout=10, check=False)
-            assert "PhytonError" in result.stdout or "OS error" in result.stdout
-        except (subprocess.TimeoutExpired, OSError):
-            pytest.skip("Could not test OS error")
-        finally:
-            os.rmdir(temp_dir)
+        output, _ = self.run_phyton_command([phy_fixtures['bad_unicode']])
+        assert "PhytonError" in output
+        assert "decode" in output
+
+    @pytest.mark.parametrize("make_arg,expected", [
+        # A directory instead of a file
+        (lambda files: os.path.dirname(files['not_phy']), "PhytonError: OS error reading file"),
+        (lambda files: os.path.join(os.path.dirname(files['not_phy']), 'missing.phy'),
+         "' not found"),
+    ], ids=['directory', 'missing-file'])
+    def test_main_function_unreadable_path(self, phy_fixtures, make_arg, expected):
+        """Test main function reports paths it cannot read as a file."""
+        output, code = self.run_phyton_command([make_arg(phy_fixtures)])
+        assert expected in output
+        assert code == 0
 
-    def test_main_function_general_exception_handling(self):
-        """Test main function general exception handling."""
-        # Mock argparse to raise an exception
-        original_argv = sys.argv.copy()
-        try:
-            sys.argv = ['phyton.py', '--invalid-option-that-does-not-exist']
-
-            with unittest.mock.patch('sys.exit') as mock_exit:
-                try:
-                    phyton.main()
-                    # Should call sys.exit(1) on error
-                    mock_exit.assert_called_with(1)
-                except SystemExit:
-                    pass  # Expected
-        except Exception:  # pylint: disable=broad-exception-caught
-            pass  # Expected for invalid arguments
-        finally:
-            sys.argv = original_argv
+    def test_main_function_unknown_option(self):
+        """Test main function rejects an unknown option with a usage error."""
+        output, code = self.run_phyton_command(['--invalid-option-that-does-not-exist'])
+        assert code == 2
+        assert "unrecognized arguments: --invalid-option-that-does-not-exist" in output
+
+    @pytest.mark.parametrize("method,args,expected,exit_code", [
+        # Running a file: reported as a likely Phyton bug, then main() returns
+        ('execute', ['not_phy'], "PhytonUnexpectedError: RuntimeError: boom", 0),
+        # Anywhere else: the top-level handler reports it and exits with 1
+        ('interactive_mode', [], "❌ Error: boom", 1),
+    ], ids=['running-file', 'top-level'])
+    def test_main_function_general_exception_handling(self, phy_fixtures, method, args,
+                                                      expected, exit_code):
+        """Test main function reports unexpected exceptions instead of crashing."""
+        paths = [phy_fixtures[name] for name in args]
+        with unittest.mock.patch.object(phyton.PhytonInterpreter, method,
+                                        side_effect=RuntimeError('boom')):
+            output, code = self.run_phyton_command(paths)
+        assert expected in output
+        assert code == exit_code
 
     def test_main_function_interactive_without_flag(self):
-        """Test main function interactive mode when no filename provided."""
-        # Mock sys.argv to simulate no file argument
-        original_argv = sys.argv.copy()
-        try:
-            sys.argv = ['phyton.py']
-
-            # Mock the interactive_mode method to avoid actual interaction
-            with unittest.mock.patch.object(phyton.PhytonInterpreter, 'interactive_mode'):
-                with unittest.mock.patch('builtins.print'):
-                    try:
-                        phyton.main()
-                    except SystemExit:
-                        pass
-        finally:
-            sys.argv = original_argv
+        """Test main function starts interactive mode when no filename provided."""
+        # Mock the interactive_mode method to avoid actual interaction
+        with unittest.mock.patch.object(phyton.PhytonInterpreter,
+                                        'interactive_mode') as mock_interactive:
+            output, code = self.run_phyton_command([])
+        mock_interactive.assert_called_once_with()
+        assert 'Welcome to Phyton' in output
+        assert code == 0
 
     # Comprehensive Behavior Tests
-    def test_fix_spelling_preserves_structure(self):
+    def test_fix_spelling_preserves_structure(self, interp):
         """Test that fix_spelling preserves code structure."""
-        interpreter = phyton.PhytonInterpreter()
         code = """
 # This is a comment
 deff hello():
@@ -936,35 +1032,32 @@ deff hello():
     prin("Hello")
     retrun None
 """
-        result = interpreter.fix_spelling(code)
+        result = interp.fix_spelling(code)
         assert '# This is a comment' in result
         assert '# Another comment' in result
         assert 'def hello():' in result
         assert 'print("Hello")' in result
         assert 'return None' in result
 
-    def test_word_boundary_matching(self):
+    def test_word_boundary_matching(self, interp):
         """Test that only whole words are matched, not substrings."""
-        interpreter = phyton.PhytonInterpreter()
         # Test that 'def' in 'define_function' is not replaced
         code = "define_function = lambda: None"
-        result = interpreter.fix_spelling(code)
+        result = interp.fix_spelling(code)
         # Should not change define_function to def_function
         assert 'define_function' in result
 
-    def test_case_sensitivity_preservation(self):
+    def test_case_sensitivity_preservation(self, interp):
         """Test that case is preserved in replacements."""
-        interpreter = phyton.PhytonInterpreter()
         code = "DEFF upper_function():\n    PRIN('test')"
-        result = interpreter.fix_spelling(code)
+        result = interp.fix_spelling(code)
         # Original behavior may vary, just ensure it doesn't crash
         assert len(result) > 0
 
-    def test_multiple_misspellings_same_line(self):
+    def test_multiple_misspellings_same_line(self, interp):
         """Test multiple misspellings on the same line."""
-        interpreter = phyton.PhytonInterpreter()
         code = "deff test(): retrun prin('hello')"
-        result = interpreter.fix_spelling(code)
+        result = interp.fix_spelling(code)
         assert 'def test():' in result
         assert 'return' in result
         assert 'print' in result